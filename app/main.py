@@ -2,10 +2,13 @@
 FastAPI application for ResuMate AI.
 Provides resume-job matching analysis endpoint.
 """
+import asyncio
 import os
+import torch
 from typing import List
 from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from sentence_transformers import SentenceTransformer
 from app.schemas import AnalyzeRequest, AnalyzeResponse, UploadResumeResponse
 from app.scoring import ResumeScorer
@@ -16,7 +19,10 @@ from app.file_extractor import FileExtractor
 app = FastAPI(
     title="ResuMate AI API",
     description="AI-powered resume-job matching service",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson serializes the mixed dict/list payloads 2-5x faster than
+    # the stdlib json encoder
+    default_response_class=ORJSONResponse
 )
 
 # CORS configuration
@@ -34,15 +40,61 @@ scorer: ResumeScorer = None
 rewriter: ResumeRewriter = None
 
 
+def _load_bi_encoder() -> SentenceTransformer:
+    """
+    Load the bi-encoder, preferring the dynamically quantized INT8 ONNX
+    weights (2-4x faster per forward pass on CPU, <1% cosine drift vs
+    FP32). Falls back to the standard PyTorch backend when the ONNX
+    extras (optimum/onnxruntime) aren't installed. Either way the
+    returned object is a SentenceTransformer, so encode() call sites
+    are unchanged.
+    """
+    try:
+        bi_encoder = SentenceTransformer(
+            'all-MiniLM-L6-v2',
+            backend='onnx',
+            model_kwargs={
+                'file_name': 'onnx/model_qint8_avx512_vnni.onnx',
+                'provider': 'CPUExecutionProvider',
+            },
+        )
+        print("Loaded INT8 ONNX bi-encoder.")
+        return bi_encoder
+    except Exception as e:
+        print(f"INT8 ONNX backend unavailable ({e}); using PyTorch FP32.")
+
+    bi_encoder = SentenceTransformer('all-MiniLM-L6-v2')
+    # Inference-only setup: eval mode, no autograd bookkeeping
+    bi_encoder.eval()
+    for param in bi_encoder.parameters():
+        param.requires_grad_(False)
+    # On GPU, half-precision weights halve memory bandwidth with no
+    # measurable embedding drift; encode() still returns float32, so
+    # downstream similarity math is unaffected. CPU stays FP32 —
+    # emulated FP16 is slower there, and the ONNX path above is the
+    # reduced-precision route for CPU deployments.
+    if torch.cuda.is_available():
+        bi_encoder = bi_encoder.half()
+    return bi_encoder
+
+
 @app.on_event("startup")
 async def startup_event():
     """Load ML model and initialize processors on startup."""
     global model, scorer, rewriter
-    
+
     try:
         # Load sentence transformer model (local, no external API)
         print("Loading sentence transformer model...")
-        model = SentenceTransformer('all-MiniLM-L6-v2')
+        model = _load_bi_encoder()
+
+        # All CPU cores for the math kernels
+        torch.set_num_threads(os.cpu_count() or 1)
+
+        # Warm up tokenizer + forward pass so the first real request
+        # doesn't pay the cold-start cost
+        with torch.inference_mode():
+            model.encode(['warmup'], convert_to_numpy=True)
         print("Model loaded successfully.")
         
         scorer = ResumeScorer(model)
@@ -86,22 +138,30 @@ async def upload_resume(file: UploadFile = File(...)):
         print(f"[UPLOAD] Route hit: /api/upload-resume")
         print(f"[UPLOAD] Filename: {filename}, Content-Type: {content_type}")
         
-        # Read file content
-        file_content = await file.read()
+        # Reject on the declared size first (when the client sent one),
+        # before buffering a single chunk
+        if file.size and file.size > FileExtractor.MAX_FILE_SIZE:
+            raise HTTPException(status_code=413, detail="File too large")
+
+        # Read file content in chunks so an oversize upload is rejected
+        # as soon as it crosses the limit instead of being fully buffered
+        buf = bytearray()
+        while True:
+            chunk = await file.read(65536)
+            if not chunk:
+                break
+            buf.extend(chunk)
+            if len(buf) > FileExtractor.MAX_FILE_SIZE:
+                raise HTTPException(status_code=413, detail="File too large")
+        file_content = bytes(buf)
         file_size = len(file_content)
         print(f"[UPLOAD] File size: {file_size} bytes")
         
         # Handle missing filename (can happen with drag-drop)
         if not file.filename:
-            # Try to infer from content-type or use default
-            if content_type == "application/pdf":
-                filename = "resume.pdf"
-            elif content_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-                filename = "resume.docx"
-            elif content_type == "text/plain":
-                filename = "resume.txt"
-            else:
-                filename = "resume.txt"  # Default fallback
+            # Infer from the file content itself (magic bytes)
+            kind = FileExtractor.detect_kind(file_content)
+            filename = f"resume.{kind or 'txt'}"
             print(f"[UPLOAD] Filename was None, using inferred: {filename}")
         
         # Validate file
@@ -113,7 +173,9 @@ async def upload_resume(file: UploadFile = File(...)):
         # Extract text
         try:
             print(f"[UPLOAD] Extracting text from {filename}")
-            extracted_text, meta = FileExtractor.extract_text(file_content, filename)
+            extracted_text, meta = await asyncio.to_thread(
+                FileExtractor.extract_text, file_content, filename
+            )
             print(f"[UPLOAD] Extraction successful. Text length: {len(extracted_text)} chars")
         except ValueError as e:
             print(f"[UPLOAD] Extraction ValueError: {e}")
@@ -150,8 +212,12 @@ async def analyze_resume_job(request: AnalyzeRequest):
         raise HTTPException(status_code=503, detail="Model not loaded. Please wait for startup.")
     
     try:
-        # Calculate match score
-        score, matched_keywords, missing_keywords = scorer.calculate_match_score(
+        # Calculate match score off the event loop: the scorer is
+        # CPU-bound (model forward passes run in C with the GIL
+        # released), and running it inline would stall every other
+        # in-flight request
+        score, matched_keywords, missing_keywords = await asyncio.to_thread(
+            scorer.calculate_match_score,
             request.resumeText,
             request.jobText
         )
@@ -164,7 +230,9 @@ async def analyze_resume_job(request: AnalyzeRequest):
         insights = generate_insights(score, top_matches, missing)
         
         # Rewrite resume bullets
-        rewritten_bullets = rewriter.rewrite_bullets(request.resumeText, count=3)
+        rewritten_bullets = await asyncio.to_thread(
+            rewriter.rewrite_bullets, request.resumeText, count=3
+        )
         
         return AnalyzeResponse(
             score=round(score, 1),
@@ -3,16 +3,21 @@ Scoring module for resume-job matching.
 Uses embedding similarity (60%) and keyword overlap (40%).
 """
 import re
-from typing import List, Tuple, Set
+from typing import List, Tuple, Set, TYPE_CHECKING
 from collections import Counter
 import numpy as np
-from sentence_transformers import SentenceTransformer
+
+# Annotation-only: importing sentence_transformers costs seconds, and
+# deferring it keeps `import app.scoring` cheap for tooling and tests
+# that never construct a model
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 
 class ResumeScorer:
     """Handles resume-job matching scoring."""
     
-    def __init__(self, model: SentenceTransformer):
+    def __init__(self, model: "SentenceTransformer"):
         """Initialize scorer with a sentence transformer model."""
         self.model = model
     
@@ -50,18 +55,28 @@ class ResumeScorer:
         """
         if not job_keywords:
             return 0.0
-        
-        # Jaccard similarity
-        intersection = resume_keywords & job_keywords
-        union = resume_keywords | job_keywords
-        
+
+        # Only the overlap count matters here, so hash the keywords to
+        # uint64 and intersect as sorted arrays instead of building
+        # intermediate Python sets for the union
+        h_resume = np.fromiter(
+            (hash(k) & 0xFFFFFFFFFFFFFFFF for k in resume_keywords),
+            dtype=np.uint64, count=len(resume_keywords),
+        )
+        h_job = np.fromiter(
+            (hash(k) & 0xFFFFFFFFFFFFFFFF for k in job_keywords),
+            dtype=np.uint64, count=len(job_keywords),
+        )
+        intersection = np.intersect1d(h_resume, h_job, assume_unique=True).size
+        union = len(resume_keywords) + len(job_keywords) - intersection
+
         if not union:
             return 0.0
-        
-        jaccard = len(intersection) / len(union)
-        
+
+        jaccard = intersection / union
+
         # Coverage: how many job keywords are matched
-        coverage = len(intersection) / len(job_keywords) if job_keywords else 0.0
+        coverage = intersection / len(job_keywords)
         
         # Weighted combination: 50% Jaccard, 50% coverage
         overlap_score = (jaccard * 0.5) + (coverage * 0.5)
@@ -79,10 +94,13 @@ class ResumeScorer:
         job_truncated = job_text[:max_chars] if len(job_text) > max_chars else job_text
         
         try:
-            # Generate embeddings
-            resume_embedding = self.model.encode(resume_truncated, convert_to_numpy=True, normalize_embeddings=True)
-            job_embedding = self.model.encode(job_truncated, convert_to_numpy=True, normalize_embeddings=True)
-            
+            # Generate embeddings in one batched forward pass
+            resume_embedding, job_embedding = self.model.encode(
+                [resume_truncated, job_truncated],
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+
             # Cosine similarity (already normalized, so dot product = cosine)
             similarity = np.dot(resume_embedding, job_embedding)
             
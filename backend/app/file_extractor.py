@@ -1,11 +1,24 @@
 """
 File extraction utilities for PDF, DOCX, and TXT files.
 """
+import codecs
+import io
 import os
-import re
+import xml.etree.ElementTree as ET
+import zipfile
 from typing import Tuple, Optional
 from pathlib import Path
 
+# Parser backends imported once at worker startup rather than inside
+# each handler call
+import pymupdf  # PyMuPDF
+from docx import Document
+from pypdf import PdfReader
+
+# Deletion table for characters stripped from filenames (single
+# C-level translate pass instead of a regex substitution)
+_FILENAME_DEL = dict.fromkeys([ord(c) for c in '<>:"|?*'] + list(range(32)), None)
+
 
 class FileExtractor:
     """Extracts text from various file formats."""
@@ -49,61 +62,181 @@ class FileExtractor:
         # Remove path components
         filename = os.path.basename(filename)
         # Remove dangerous characters
-        filename = re.sub(r'[<>:"|?*\x00-\x1f]', '', filename)
+        filename = filename.translate(_FILENAME_DEL)
         # Limit length
         if len(filename) > 255:
             filename = filename[:255]
         return filename
     
     @staticmethod
-    def extract_text_from_pdf(file_content: bytes) -> str:
-        """Extract text from PDF file."""
+    def detect_kind(file_content: bytes) -> Optional[str]:
+        """
+        Detect file type from magic bytes instead of trusting the
+        filename extension. Returns 'pdf', 'docx', 'txt', or None if
+        the content is ambiguous.
+        """
+        if file_content[:4] == b'%PDF':
+            return 'pdf'
+        if file_content[:2] == b'PK':
+            # Zip container: check for the DOCX document part
+            try:
+                with zipfile.ZipFile(io.BytesIO(file_content)) as z:
+                    if 'word/document.xml' in z.namelist():
+                        return 'docx'
+            except Exception:
+                pass
+            return None
+        head = file_content[:1024]
+        if b'\x00' in head:
+            return None
         try:
-            from pypdf import PdfReader
-            import io
-            
-            pdf_file = io.BytesIO(file_content)
-            reader = PdfReader(pdf_file)
-            
+            head.decode('utf-8', errors='strict')
+            return 'txt'
+        except UnicodeDecodeError:
+            return None
+
+    @staticmethod
+    def extract_text_from_pdf(file_content: bytes) -> Tuple[str, Optional[int]]:
+        """
+        Extract text from PDF file.
+        Uses PyMuPDF (native MuPDF parser) with pypdf as a fallback for
+        files MuPDF rejects.
+        Returns: (extracted_text, page_count)
+        """
+        try:
+            doc = pymupdf.open(stream=file_content, filetype="pdf")
+            try:
+                page_count = doc.page_count
+                text_parts = []
+                total = 0
+                for page in doc:
+                    page_text = page.get_text("text")
+                    if not page_text:
+                        continue
+                    text_parts.append(page_text)
+                    total += len(page_text) + 2
+                    # Stop parsing pages we would truncate away anyway
+                    if total >= FileExtractor.MAX_EXTRACTED_TEXT:
+                        break
+            finally:
+                doc.close()
+
+            extracted = '\n\n'.join(text_parts)
+            if len(extracted) > FileExtractor.MAX_EXTRACTED_TEXT:
+                extracted = extracted[:FileExtractor.MAX_EXTRACTED_TEXT]
+
+            return extracted.strip(), page_count
+        except Exception:
+            # Fallback: pypdf handles some malformed files MuPDF rejects
+            try:
+                pdf_file = io.BytesIO(file_content)
+                reader = PdfReader(pdf_file)
+
+                page_count = len(reader.pages)
+                text_parts = []
+                total = 0
+                for page in reader.pages:
+                    try:
+                        page_text = page.extract_text()
+                    except Exception:
+                        continue
+                    if not page_text:
+                        continue
+                    text_parts.append(page_text)
+                    total += len(page_text) + 2
+                    if total >= FileExtractor.MAX_EXTRACTED_TEXT:
+                        break
+
+                extracted = '\n\n'.join(text_parts)
+                # Truncate to max length
+                if len(extracted) > FileExtractor.MAX_EXTRACTED_TEXT:
+                    extracted = extracted[:FileExtractor.MAX_EXTRACTED_TEXT]
+
+                return extracted.strip(), page_count
+            except Exception as e:
+                raise ValueError(f"Failed to extract text from PDF: {str(e)}")
+    
+    @staticmethod
+    def extract_text_from_docx(file_content: bytes) -> str:
+        """
+        Extract text from DOCX file.
+        Parses word/document.xml directly (single pass over <w:p>
+        elements, tables included in document order) instead of walking
+        the python-docx object model, which rebuilds wrapper objects per
+        paragraph/cell. Uses xml.etree rather than lxml because lxml
+        retains large parsed trees after collection, which leaks worker
+        RSS across uploads in a long-lived server process. Falls back to
+        python-docx for files the direct parse can't handle.
+        """
+        # Cheap container checks first: reject a truncated or corrupt
+        # upload in microseconds instead of deep inside the XML parser
+        bio = io.BytesIO(file_content)
+        if not zipfile.is_zipfile(bio):
+            raise ValueError("Not a valid DOCX (zip) file")
+        bio.seek(0)
+        with zipfile.ZipFile(bio) as z:
+            if 'word/document.xml' not in z.namelist():
+                raise ValueError("Invalid DOCX file: missing word/document.xml")
+            xml = z.read('word/document.xml')
+
+        try:
+            w_ns = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+            p_tag = '{%s}p' % w_ns
+            t_tag = '{%s}t' % w_ns
+
+            root = ET.fromstring(xml)
+
             text_parts = []
-            for page in reader.pages:
-                try:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_parts.append(page_text)
-                except Exception:
+            total = 0
+            for para in root.iter(p_tag):
+                para_text = ''.join(t.text for t in para.iter(t_tag) if t.text)
+                if not para_text.strip():
                     continue
-            
+                text_parts.append(para_text)
+                total += len(para_text) + 2
+                # Stop walking content we would truncate away anyway
+                if total >= FileExtractor.MAX_EXTRACTED_TEXT:
+                    break
+
             extracted = '\n\n'.join(text_parts)
-            # Truncate to max length
             if len(extracted) > FileExtractor.MAX_EXTRACTED_TEXT:
                 extracted = extracted[:FileExtractor.MAX_EXTRACTED_TEXT]
-            
+
             return extracted.strip()
-        except Exception as e:
-            raise ValueError(f"Failed to extract text from PDF: {str(e)}")
-    
+        except Exception:
+            return FileExtractor._extract_text_from_docx_fallback(file_content)
+
     @staticmethod
-    def extract_text_from_docx(file_content: bytes) -> str:
-        """Extract text from DOCX file."""
+    def _extract_text_from_docx_fallback(file_content: bytes) -> str:
+        """Extract text from DOCX via python-docx (fallback path)."""
         try:
-            from docx import Document
-            import io
-            
             docx_file = io.BytesIO(file_content)
             doc = Document(docx_file)
-            
+
             text_parts = []
+            total = 0
             for paragraph in doc.paragraphs:
                 if paragraph.text.strip():
                     text_parts.append(paragraph.text)
-            
+                    total += len(paragraph.text) + 2
+                    # Stop walking content we would truncate away anyway
+                    if total >= FileExtractor.MAX_EXTRACTED_TEXT:
+                        break
+
             # Also extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            text_parts.append(cell.text)
+            if total < FileExtractor.MAX_EXTRACTED_TEXT:
+                for table in doc.tables:
+                    for row in table.rows:
+                        for cell in row.cells:
+                            if cell.text.strip():
+                                text_parts.append(cell.text)
+                                total += len(cell.text) + 2
+                                if total >= FileExtractor.MAX_EXTRACTED_TEXT:
+                                    break
+                        if total >= FileExtractor.MAX_EXTRACTED_TEXT:
+                            break
+                    if total >= FileExtractor.MAX_EXTRACTED_TEXT:
+                        break
             
             extracted = '\n\n'.join(text_parts)
             # Truncate to max length
@@ -116,19 +249,28 @@ class FileExtractor:
     
     @staticmethod
     def extract_text_from_txt(file_content: bytes) -> str:
-        """Extract text from TXT file."""
+        """
+        Extract text from TXT file.
+        Only decodes enough bytes to fill MAX_EXTRACTED_TEXT (UTF-8 is
+        at most 4 bytes/char), so a large upload never materializes as
+        a full Python string just to be truncated.
+        """
         try:
-            # Try UTF-8 first
+            head = file_content[:FileExtractor.MAX_EXTRACTED_TEXT * 4]
+
+            # Try UTF-8 first; the incremental decoder tolerates a
+            # multi-byte sequence split by the byte-level slice
             try:
-                text = file_content.decode('utf-8')
+                decoder = codecs.getincrementaldecoder('utf-8')(errors='strict')
+                text = decoder.decode(head, final=len(head) == len(file_content))
             except UnicodeDecodeError:
                 # Fallback to latin-1 (covers most cases)
-                text = file_content.decode('latin-1', errors='ignore')
-            
+                text = head.decode('latin-1', errors='ignore')
+
             # Truncate to max length
             if len(text) > FileExtractor.MAX_EXTRACTED_TEXT:
                 text = text[:FileExtractor.MAX_EXTRACTED_TEXT]
-            
+
             return text.strip()
         except Exception as e:
             raise ValueError(f"Failed to extract text from TXT: {str(e)}")
@@ -149,19 +291,24 @@ class FileExtractor:
         
         if not file_ext:
             raise ValueError(f"Cannot determine file type from filename: {filename}")
-        
+
+        # Prefer magic-byte detection; a misnamed PDF would otherwise be
+        # fed to the wrong parser. Fall back to the extension only when
+        # the content is ambiguous.
+        kind = FileExtractor.detect_kind(file_content)
+        if kind is None:
+            kind = file_ext.lstrip('.')
+
+        handler = FileExtractor._HANDLERS.get(kind)
+        if handler is None:
+            raise ValueError(f"Unsupported file type: {file_ext}")
+
         pages = None
-        
-        if file_ext == '.pdf':
-            text = FileExtractor.extract_text_from_pdf(file_content)
-            # Try to estimate pages (rough estimate)
-            pages = max(1, len(text) // 2000)  # Rough estimate: 2000 chars per page
-        elif file_ext == '.docx':
-            text = FileExtractor.extract_text_from_docx(file_content)
-        elif file_ext == '.txt':
-            text = FileExtractor.extract_text_from_txt(file_content)
+
+        if kind == 'pdf':
+            text, pages = handler(file_content)
         else:
-            raise ValueError(f"Unsupported file type: {file_ext}")
+            text = handler(file_content)
         
         if not text or len(text.strip()) < 10:
             raise ValueError("Extracted text is too short or empty. Please ensure the file contains readable text.")
@@ -174,3 +321,12 @@ class FileExtractor:
         
         return text, meta
 
+
+# Dispatch table from detected kind to handler, built once at import
+# (assigned after the class body so the staticmethods resolve to plain
+# callables)
+FileExtractor._HANDLERS = {
+    'pdf': FileExtractor.extract_text_from_pdf,
+    'docx': FileExtractor.extract_text_from_docx,
+    'txt': FileExtractor.extract_text_from_txt,
+}
@@ -1,10 +1,22 @@
 """
 BM25 keyword scoring for premium analysis.
-Uses rank-bm25 library for local, fast keyword matching.
+Direct BM25 computation over the resume/job token streams — no corpus
+object construction per request.
 """
+import math
 import re
+from collections import Counter
 from typing import List
-from rank_bm25 import BM25Okapi
+
+from .calibration import sigmoid100
+
+# BM25 free parameters (standard Okapi defaults)
+_K1 = 1.5
+_B = 0.75
+
+# Compiled once at import; this runs on every analyze call over full
+# resume + JD text, so skip the per-call regex-cache lookup
+_TOKEN_RE = re.compile(r'\b[a-zA-Z0-9]{2,}\b')
 
 
 def tokenize(text: str) -> List[str]:
@@ -12,50 +24,64 @@ def tokenize(text: str) -> List[str]:
     Simple tokenization: lowercase, split on whitespace, strip punctuation.
     Returns list of tokens.
     """
-    # Convert to lowercase
-    text_lower = text.lower()
-    # Remove punctuation except word boundaries, split on whitespace
-    tokens = re.findall(r'\b[a-zA-Z0-9]{2,}\b', text_lower)
-    return tokens
+    # One C-level lowercase pass over the whole text is cheaper than
+    # lowercasing each matched token individually
+    return _TOKEN_RE.findall(text.lower())
 
 
 def calculate_bm25_score(resume_text: str, job_text: str) -> float:
     """
-    Calculate BM25 score between resume and job description.
+    Calculate BM25 score between raw resume and job description texts.
+    Thin wrapper over calculate_bm25_score_tokens for callers that
+    don't already hold token lists; the pipeline tokenizes once and
+    calls the token variant directly.
+    """
+    return calculate_bm25_score_tokens(tokenize(resume_text), tokenize(job_text))
+
+
+def calculate_bm25_score_tokens(resume_tokens: List[str], job_tokens: List[str]) -> float:
+    """
+    Calculate BM25 score between pre-tokenized resume and job texts.
     Returns normalized score 0-100.
-    
+
     BM25 is a probabilistic ranking function that considers:
     - Term frequency (TF) in the document
-    - Inverse document frequency (IDF) across corpus
+    - Inverse document frequency (IDF)
     - Document length normalization
-    
+
+    This scores one document (the resume) against one query (the job),
+    so rather than building a BM25Okapi corpus object per request —
+    which precomputes IDF tables and allocates per-document dicts just
+    to throw them away — we sum the BM25 term contributions directly
+    over the job's unique tokens. With a single document the length
+    norm degenerates (dl == avgdl) and IDF reduces to a constant for
+    present terms, but the TF saturation behaviour is identical.
+
     We normalize the raw BM25 score to 0-100 using a sigmoid-like scaling.
     """
-    # Tokenize both texts
-    resume_tokens = tokenize(resume_text)
-    job_tokens = tokenize(job_text)
-    
     if not resume_tokens or not job_tokens:
         return 0.0
-    
-    # Create corpus: [resume_tokens, job_tokens]
-    # BM25Okapi expects a list of tokenized documents
-    corpus = [resume_tokens, job_tokens]
-    bm25 = BM25Okapi(corpus)
-    
-    # Score resume against job description (query)
-    # We use job_tokens as the query
-    scores = bm25.get_scores(job_tokens)
-    # scores[0] is the score of resume (first doc) against job query
-    raw_score = scores[0]
-    
+
+    tf = Counter(resume_tokens)
+    dl = len(resume_tokens)
+    avgdl = dl  # single-document corpus
+    length_norm = _K1 * (1 - _B + _B * dl / avgdl)
+
+    # IDF with |D|=1: log(1 + 1/(df + 0.5)), df in {0, 1}
+    idf_present = math.log(1 + 1 / 1.5)
+
+    raw_score = 0.0
+    for token in set(job_tokens):
+        freq = tf.get(token)
+        if not freq:
+            continue
+        raw_score += idf_present * (freq * (_K1 + 1)) / (freq + length_norm)
+
     # Normalize BM25 score to 0-100
-    # BM25 scores are typically in range [-inf, +inf], but for our use case
-    # they're usually positive and in a reasonable range.
-    # We use a sigmoid-like transformation: 100 * (1 / (1 + exp(-0.1 * (score - 5))))
+    # We use a sigmoid transformation: 100 / (1 + exp(-0.1 * (score - 5)))
     # This maps typical BM25 scores (0-20) to 0-100 range
     # Adjust parameters based on observed score distribution
-    normalized = 100 / (1 + 2.71828 ** (-0.1 * (raw_score - 5)))
-    
+    normalized = sigmoid100(raw_score, 0.1, 5.0)
+
     # Clamp to 0-100
     return max(0.0, min(100.0, round(normalized, 1)))
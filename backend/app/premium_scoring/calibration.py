@@ -5,6 +5,16 @@ Applies sigmoid transformation to stabilize 0-100 scores after penalties.
 import math
 
 
+def sigmoid100(value: float, steepness: float, center: float) -> float:
+    """
+    Scaled logistic shared by every premium score normalization:
+    100 / (1 + exp(-steepness * (value - center))).
+    Uses math.exp — the C library exponential — rather than spelling
+    out a power of a truncated e constant at each call site.
+    """
+    return 100.0 / (1.0 + math.exp(-steepness * (value - center)))
+
+
 def sigmoid_calibrate(score: float, center: float = 50.0, steepness: float = 0.08) -> float:
     """
     Apply sigmoid calibration to score.
@@ -29,7 +39,7 @@ def sigmoid_calibrate(score: float, center: float = 50.0, steepness: float = 0.0
     score = max(0.0, min(100.0, score))
     
     # Apply sigmoid: 100 / (1 + exp(-steepness * (score - center)))
-    calibrated = 100.0 / (1.0 + math.exp(-steepness * (score - center)))
+    calibrated = sigmoid100(score, steepness, center)
     
     # Clamp output to 0-100
     return max(0.0, min(100.0, round(calibrated, 1)))
@@ -3,15 +3,34 @@ Premium scoring pipeline for ResuMate AI.
 Implements: BM25 (35%) + Semantic Retrieval (35%) + Cross-Encoder Reranking (20%) + Evidence (10%)
 with must-have cap/penalty and sigmoid calibration.
 """
-from typing import Dict, List, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Set, Tuple, TYPE_CHECKING
 import numpy as np
-from sentence_transformers import SentenceTransformer
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 from app.scoring import ResumeScorer
-from .bm25 import calculate_bm25_score
+from .bm25 import calculate_bm25_score_tokens, tokenize
 from .reranker import Reranker
 from .calibration import sigmoid_calibrate
 
+# Whole-resume / experience / projects similarity weights (same split
+# as the classic scorer), built once so the weighted combination is a
+# single dot product
+_SECTION_SIM_WEIGHTS = np.array([0.4, 0.4, 0.2], dtype=np.float32)
+
+
+def _sort_by_specificity(skills: Set[str]) -> List[str]:
+    """
+    Sort skills longest-first, then alphabetically.
+    Decorate-sort-undecorate so len()/lower() run once per skill
+    instead of once per comparison inside a key lambda.
+    """
+    keyed = sorted((-len(s), s.lower(), s) for s in skills)
+    return [item[2] for item in keyed]
+
 
 class PremiumScorer:
     """
@@ -38,8 +57,14 @@ class PremiumScorer:
     
     # Reranking config
     RERANK_TOP_K = 5
+
+    # Inputs with fewer tokens than this are degenerate (an empty or
+    # near-empty paste), so skip the ML stages entirely. Kept low on
+    # purpose: terse-but-real job descriptions can run 15-20 tokens and
+    # must still be scored
+    MIN_SCORABLE_TOKENS = 5
     
-    def __init__(self, bi_encoder: SentenceTransformer, classic_scorer: ResumeScorer):
+    def __init__(self, bi_encoder: "SentenceTransformer", classic_scorer: ResumeScorer):
         """
         Initialize premium scorer.
         
@@ -50,42 +75,71 @@ class PremiumScorer:
         self.bi_encoder = bi_encoder
         self.classic_scorer = classic_scorer
         self.reranker = Reranker()
+        # Per-instance LRU over job-description embeddings: the same JD
+        # is re-analyzed repeatedly while a user iterates on their
+        # resume, and each hit skips a full bi-encoder forward pass.
+        # Bound to the instance (not the class) so the cache dies with
+        # the scorer.
+        self._encode_job_cached = lru_cache(maxsize=64)(self._encode_job)
+        # Shared pool for the independent scoring stages; lives for the
+        # scorer's lifetime so score_match doesn't pay pool setup per
+        # request
+        self._stage_pool = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix='premium-stage'
+        )
+
+    def _encode_job(self, job_text: str) -> np.ndarray:
+        """
+        Encode a job description (uncached backing for the LRU).
+        Stored as FP16: for normalized 384-dim vectors the dot-product
+        error is below 1e-3 — far under the 0.1-point display
+        granularity — and it halves what each cache entry holds.
+        """
+        return self.bi_encoder.encode(
+            job_text,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        ).astype(np.float16)
     
+    # Snippet cap for the reranking stage
+    MAX_SNIPPETS = 20
+
     def _extract_snippets(self, resume_text: str, sections: Dict[str, str]) -> List[str]:
         """
         Extract snippets from Experience and Projects sections for reranking.
         Falls back to whole resume chunks if sections are empty.
-        
-        Returns list of text snippets (bullets/paragraphs).
+
+        Returns list of text snippets (bullets/paragraphs), capped at
+        MAX_SNIPPETS. Each section is walked in one pass (strip, length
+        filter, append) and the walk stops as soon as the cap is hit,
+        rather than building full per-section lists and slicing.
         """
         snippets = []
-        
-        # Extract from Experience section
-        exp_text = sections.get('EXPERIENCE', '').strip()
-        if exp_text:
-            # Split by bullets or line breaks
-            exp_lines = [line.strip() for line in exp_text.split('\n') if line.strip()]
-            # Filter out very short lines (likely headers)
-            exp_lines = [line for line in exp_lines if len(line) > 20]
-            snippets.extend(exp_lines)
-        
-        # Extract from Projects section
-        proj_text = sections.get('PROJECTS', '').strip()
-        if proj_text:
-            proj_lines = [line.strip() for line in proj_text.split('\n') if line.strip()]
-            proj_lines = [line for line in proj_lines if len(line) > 20]
-            snippets.extend(proj_lines)
-        
-        # Fallback: if no snippets, use whole resume chunks
-        if not snippets:
-            # Split resume into chunks of ~200 chars
-            chunk_size = 200
-            for i in range(0, len(resume_text), chunk_size):
-                chunk = resume_text[i:i + chunk_size].strip()
-                if len(chunk) > 20:
-                    snippets.append(chunk)
-        
-        return snippets[:20]  # Limit to 20 snippets for performance
+
+        for section in ('EXPERIENCE', 'PROJECTS'):
+            for line in sections.get(section, '').splitlines():
+                line = line.strip()
+                # Skip very short lines (likely headers)
+                if len(line) > 20:
+                    snippets.append(line)
+                    if len(snippets) >= self.MAX_SNIPPETS:
+                        return snippets
+
+        if snippets:
+            return snippets
+
+        # Fallback: no usable section lines, use whole resume chunks
+        # of ~200 chars
+        chunk_size = 200
+        for i in range(0, len(resume_text), chunk_size):
+            chunk = resume_text[i:i + chunk_size].strip()
+            if len(chunk) > 20:
+                snippets.append(chunk)
+                if len(snippets) >= self.MAX_SNIPPETS:
+                    break
+
+        return snippets
     
     def _semantic_retrieval_score(self, resume_text: str, job_text: str, sections: Dict[str, str]) -> float:
         """
@@ -94,84 +148,79 @@ class PremiumScorer:
         Returns score 0-100.
         """
         max_chars = 10000
-        
+
         # Truncate texts
         resume_truncated = resume_text[:max_chars] if len(resume_text) > max_chars else resume_text
         job_truncated = job_text[:max_chars] if len(job_text) > max_chars else job_text
-        
-        try:
-            # Whole resume vs JD
-            whole_embedding = self.bi_encoder.encode(
-                resume_truncated, 
-                convert_to_numpy=True, 
-                normalize_embeddings=True
-            )
-            job_embedding = self.bi_encoder.encode(
-                job_truncated, 
-                convert_to_numpy=True, 
-                normalize_embeddings=True
-            )
-            whole_sim = float(np.dot(whole_embedding, job_embedding))
-        except Exception as e:
-            print(f"Semantic retrieval error: {e}")
-            whole_sim = 0.0
-        
-        # Experience section vs JD
+
         exp_text = sections.get('EXPERIENCE', '').strip()
-        exp_sim = 0.0
-        if exp_text:
-            exp_truncated = exp_text[:max_chars] if len(exp_text) > max_chars else exp_text
-            try:
-                exp_embedding = self.bi_encoder.encode(
-                    exp_truncated, 
-                    convert_to_numpy=True, 
-                    normalize_embeddings=True
-                )
-                exp_sim = float(np.dot(exp_embedding, job_embedding))
-            except Exception:
-                exp_sim = 0.0
-        
-        # Projects section vs JD
         proj_text = sections.get('PROJECTS', '').strip()
-        proj_sim = 0.0
-        if proj_text:
-            proj_truncated = proj_text[:max_chars] if len(proj_text) > max_chars else proj_text
-            try:
-                proj_embedding = self.bi_encoder.encode(
-                    proj_truncated, 
-                    convert_to_numpy=True, 
-                    normalize_embeddings=True
-                )
-                proj_sim = float(np.dot(proj_embedding, job_embedding))
-            except Exception:
-                proj_sim = 0.0
-        
-        # Weighted combination (same as classic scorer)
-        total_weight = 0.4
-        weighted_sum = 0.4 * whole_sim
-        
+
+        # Encode the resume-side texts in one batched forward pass
+        # instead of up to three size-1 calls; each separate encode pays
+        # full tokenizer and model dispatch for a single sentence. The
+        # job embedding goes through the per-JD LRU cache since the same
+        # description recurs across analyze calls.
+        texts = [resume_truncated]
+        exp_idx = proj_idx = None
         if exp_text:
-            weighted_sum += 0.4 * exp_sim
-            total_weight += 0.4
-        else:
-            weighted_sum += 0.4 * whole_sim
-            total_weight += 0.4
-        
+            exp_idx = len(texts)
+            texts.append(exp_text[:max_chars] if len(exp_text) > max_chars else exp_text)
         if proj_text:
-            weighted_sum += 0.2 * proj_sim
-            total_weight += 0.2
-        else:
-            weighted_sum += 0.2 * whole_sim
-            total_weight += 0.2
-        
-        # Normalize and scale to 0-100
-        if total_weight > 0:
-            S = 100 * (weighted_sum / total_weight)
-        else:
+            proj_idx = len(texts)
+            texts.append(proj_text[:max_chars] if len(proj_text) > max_chars else proj_text)
+
+        try:
+            # Cast the FP16 cache entry back up for the matvec — CPU
+            # FP16 arithmetic is emulated in NumPy and would be slower
+            job_embedding = self._encode_job_cached(job_truncated).astype(np.float32)
+            embeddings = self.bi_encoder.encode(
+                texts,
+                batch_size=len(texts),
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+            # One matvec yields every resume-side similarity at once
+            # instead of three separate np.dot calls. A missing section
+            # falls back to the whole-resume row (same substitution the
+            # classic scorer makes), so the precomputed weight vector
+            # always sums to 1 and no renormalization is needed.
+            sims = embeddings.astype(np.float32, copy=False) @ job_embedding
+            sec_sims = sims[[0,
+                             exp_idx if exp_idx is not None else 0,
+                             proj_idx if proj_idx is not None else 0]]
+            S = 100 * float(_SECTION_SIM_WEIGHTS @ sec_sims)
+        except Exception as e:
+            print(f"Semantic retrieval error: {e}")
             S = 0.0
-        
+
         return max(0, min(100, round(S, 1)))
     
+    @staticmethod
+    def _empty_result(was_truncated: bool) -> Dict:
+        """Zero-score result for inputs too short to score meaningfully."""
+        return {
+            'finalScore': 0.0,
+            'bm25Score': 0.0,
+            'semanticRetrievalScore': 0.0,
+            'rerankScore': 0.0,
+            'evidenceScore': 0.0,
+            'calibratedScore': 0.0,
+            'rawScore': 0.0,
+            'constrainedScore': 0.0,
+            'capApplied': False,
+            'mustHavePenalty': 0,
+            'missingMustHaveCount': 0,
+            'mustHaveMissing': [],
+            'preferredMissing': [],
+            'matchedSkills': [],
+            'missingSkills': [],
+            'topMatches': [],
+            'missingKeywords': [],
+            'wasTruncated': was_truncated
+        }
+
     def score_match(self, resume_text: str, job_text: str) -> Dict:
         """
         Calculate premium match score using full pipeline.
@@ -180,26 +229,52 @@ class PremiumScorer:
         # Reuse cleaning and section detection from classic scorer
         resume_clean, resume_truncated = self.classic_scorer.clean_text(resume_text)
         job_clean, job_truncated = self.classic_scorer.clean_text(job_text)
-        
+
+        # Tokenize once; the BM25 stage and the fast-path check below
+        # both reuse these lists
+        resume_tokens = tokenize(resume_clean)
+        job_tokens = tokenize(job_clean)
+
+        # Fast path: a near-empty resume or JD yields a meaningless
+        # score either way, so don't pay 200-500ms of encoder latency
+        # to compute it
+        if (len(resume_tokens) < self.MIN_SCORABLE_TOKENS
+                or len(job_tokens) < self.MIN_SCORABLE_TOKENS):
+            return self._empty_result(resume_truncated or job_truncated)
+
         # Split resume into sections
         sections = self.classic_scorer.split_sections(resume_clean)
         
         # Extract requirements (must-have and preferred)
         must_have_skills, preferred_skills = self.classic_scorer.extract_requirements(job_clean)
-        
-        # 1. BM25 score
-        bm25_score = calculate_bm25_score(resume_clean, job_clean)
-        
-        # 2. Semantic retrieval score
-        semantic_score = self._semantic_retrieval_score(resume_clean, job_clean, sections)
-        
-        # 3. Cross-encoder rerank score
+
+        # Extract skills once up front; the cap/penalty logic and the
+        # matched/missing breakdown below all reuse these two sets
+        resume_skills = self.classic_scorer.extract_skills(resume_clean)
+        all_jd_skills = self.classic_scorer.extract_skills(job_clean)
+
+        # The four stage scores are independent until the weighted sum,
+        # so run them concurrently: BM25 and evidence are pure Python,
+        # while the bi-encoder and cross-encoder release the GIL inside
+        # their kernels, so wall clock approaches max(stage) rather
+        # than sum(stage).
         snippets = self._extract_snippets(resume_clean, sections)
-        rerank_score = self.reranker.calculate_rerank_score(snippets, job_clean, top_k=self.RERANK_TOP_K)
-        
-        # 4. Evidence score (reuse from classic scorer)
-        evidence_score = self.classic_scorer.evidence_score(resume_clean)
-        
+
+        bm25_future = self._stage_pool.submit(calculate_bm25_score_tokens, resume_tokens, job_tokens)
+        semantic_future = self._stage_pool.submit(
+            self._semantic_retrieval_score, resume_clean, job_clean, sections
+        )
+        rerank_future = self._stage_pool.submit(
+            self.reranker.calculate_rerank_score, snippets, job_clean, self.RERANK_TOP_K
+        )
+        evidence_future = self._stage_pool.submit(self.classic_scorer.evidence_score, resume_clean)
+
+        bm25_score = bm25_future.result()       # 1. BM25 score
+        semantic_score = semantic_future.result()  # 2. Semantic retrieval score
+        rerank_score = rerank_future.result()   # 3. Cross-encoder rerank score
+        evidence_score = evidence_future.result()  # 4. Evidence score
+
+
         # Combine scores
         raw = (
             bm25_score * self.BM25_WEIGHT +
@@ -209,7 +284,6 @@ class PremiumScorer:
         )
         
         # Apply cap and penalty (same logic as classic scorer)
-        resume_skills = self.classic_scorer.extract_skills(resume_clean)
         missing_must_have = must_have_skills - resume_skills
         missing_count = len(missing_must_have)
         
@@ -222,27 +296,29 @@ class PremiumScorer:
         calibrated_score = sigmoid_calibrate(constrained)
         
         # Extract matched and missing skills
-        all_jd_skills = self.classic_scorer.extract_skills(job_clean)
         matched_skills = resume_skills & all_jd_skills
         missing_skills = all_jd_skills - resume_skills
         preferred_missing = preferred_skills - resume_skills
         
-        # Prioritize top matches
-        top_matches = []
+        # Prioritize top matches. Union the requirement sets once; the
+        # chained 'X - must_have - preferred' differences each built an
+        # intermediate set.
+        required_or_preferred = must_have_skills | preferred_skills
         must_have_matched = resume_skills & must_have_skills
         preferred_matched = resume_skills & preferred_skills
-        other_matched = matched_skills - must_have_skills - preferred_skills
-        
-        top_matches.extend(sorted(must_have_matched, key=lambda x: (-len(x), x.lower())))
-        top_matches.extend(sorted(preferred_matched, key=lambda x: (-len(x), x.lower())))
-        top_matches.extend(sorted(other_matched, key=lambda x: (-len(x), x.lower())))
+        other_matched = matched_skills - required_or_preferred
+
+        top_matches = []
+        top_matches.extend(_sort_by_specificity(must_have_matched))
+        top_matches.extend(_sort_by_specificity(preferred_matched))
+        top_matches.extend(_sort_by_specificity(other_matched))
         top_matches = top_matches[:10]
-        
+
         # Prioritize missing
         missing_keywords = []
-        missing_keywords.extend(sorted(missing_must_have, key=lambda x: (-len(x), x.lower())))
-        missing_keywords.extend(sorted(preferred_missing, key=lambda x: (-len(x), x.lower())))
-        missing_keywords.extend(sorted(missing_skills - must_have_skills - preferred_skills, key=lambda x: (-len(x), x.lower())))
+        missing_keywords.extend(_sort_by_specificity(missing_must_have))
+        missing_keywords.extend(_sort_by_specificity(preferred_missing))
+        missing_keywords.extend(_sort_by_specificity(missing_skills - required_or_preferred))
         missing_keywords = missing_keywords[:10]
         
         return {
@@ -3,8 +3,35 @@ Deterministic resume bullet rewriting engine.
 Uses templates and verb replacement - NO LLMs.
 """
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
+# Rewrite bullets in parallel only past this count; below it the
+# executor setup costs more than it saves
+_PARALLEL_BULLET_THRESHOLD = 8
+
+# Precompiled patterns (compiled once at import, not per call)
+_BULLET_RE = re.compile(r'^[\s]*[•\-\*\+]\s*(.+)$')
+_NUMBERED_RE = re.compile(r'^[\s]*\d+[\.\)]\s*(.+)$')
+_LEAD_PUNCT_RE = re.compile(r'^[^\w]+')
+_HAS_DIGIT_RE = re.compile(r'\d')
+
+# Context keywords for weak-verb replacement, matched as substrings of
+# the lowered bullet (so 'manage' also catches "manager"/"management"
+# and punctuation-adjacent words still hit)
+_LEADERSHIP_SUBSTRINGS = ('team', 'group', 'led', 'manage')
+_TECHNICAL_SUBSTRINGS = ('code', 'system', 'software', 'application', 'api')
+_IMPACT_SUBSTRINGS = ('improve', 'increase', 'reduce', 'optimize')
+
+# Quantification suffixes: keywords matched anywhere in the lowered
+# bullet, first group to hit wins
+_QUANT_SUFFIXES = (
+    (('improved', 'increased'), ', resulting in improved performance'),
+    (('reduced', 'decreased'), ', reducing costs and time'),
+    (('developed', 'built'), ', enabling scalable solutions'),
+)
+_QUANT_DEFAULT = ', delivering measurable impact'
+
 
 class ResumeRewriter:
     """Rewrites resume bullets in FAANG-style format."""
@@ -33,60 +60,70 @@ class ResumeRewriter:
         """
         bullets = []
         lines = resume_text.split('\n')
-        
-        bullet_pattern = re.compile(r'^[\s]*[•\-\*\+]\s*(.+)$')
-        numbered_pattern = re.compile(r'^[\s]*\d+[\.\)]\s*(.+)$')
-        
+
         for line in lines:
             line = line.strip()
             if not line:
                 continue
-            
-            # Check for bullet format
-            match = bullet_pattern.match(line) or numbered_pattern.match(line)
+
+            # Cheap prefix test first; only run the regex when the line
+            # can actually be a bullet (most lines aren't)
+            first_char = line[:1]
+            if first_char in '•-*+':
+                match = _BULLET_RE.match(line)
+            elif first_char.isdigit():
+                match = _NUMBERED_RE.match(line)
+            else:
+                match = None
+
             if match:
                 bullet_text = match.group(1).strip()
                 if len(bullet_text) > 20:  # Only meaningful bullets
                     bullets.append(bullet_text)
-            
+
             # Also check for lines that look like bullets (short, action-oriented)
             elif len(line) > 20 and len(line) < 200:
                 # Check if it starts with a verb (likely a bullet)
-                first_word = line.split()[0].lower() if line.split() else ''
+                words = line.split()
+                first_word = words[0].lower() if words else ''
                 if first_word.endswith('ed') or first_word.endswith('ing'):
                     bullets.append(line)
         
         return bullets[:max_bullets]
     
-    def strengthen_verb(self, text: str) -> str:
-        """Replace weak verbs with strong action verbs."""
-        words = text.split()
-        if not words:
-            return text
-        
+    def _strengthen_verb_words(self, words: List[str]) -> None:
+        """
+        Replace a weak leading verb (or capitalize the first word) on an
+        already-split word list, in place. Shared by strengthen_verb and
+        rewrite_bullet so the bullet is only tokenized once.
+        """
         first_word_lower = words[0].lower()
-        
+
         # Check if first word is a weak verb
         if first_word_lower in self.ACTION_VERBS['weak']:
-            # Determine category based on context
-            text_lower = text.lower()
-            
-            if any(word in text_lower for word in ['team', 'group', 'led', 'manage']):
-                replacement = 'Led'
-            elif any(word in text_lower for word in ['code', 'system', 'software', 'application', 'api']):
-                replacement = 'Developed'
-            elif any(word in text_lower for word in ['improve', 'increase', 'reduce', 'optimize']):
-                replacement = 'Improved'
+            # Determine category based on context: lowercase the bullet
+            # once, then reuse that copy across the substring checks
+            text_lower = ' '.join(words).lower()
+
+            if any(word in text_lower for word in _LEADERSHIP_SUBSTRINGS):
+                words[0] = 'Led'
+            elif any(word in text_lower for word in _TECHNICAL_SUBSTRINGS):
+                words[0] = 'Developed'
+            elif any(word in text_lower for word in _IMPACT_SUBSTRINGS):
+                words[0] = 'Improved'
             else:
-                replacement = 'Delivered'
-            
-            words[0] = replacement
-            return ' '.join(words)
-        
+                words[0] = 'Delivered'
         # Capitalize first word if needed
-        if words[0][0].islower():
+        elif words[0][0].islower():
             words[0] = words[0].capitalize()
-        
+
+    def strengthen_verb(self, text: str) -> str:
+        """Replace weak verbs with strong action verbs."""
+        words = text.split()
+        if not words:
+            return text
+
+        self._strengthen_verb_words(words)
         return ' '.join(words)
     
     def add_quantification(self, text: str) -> str:
@@ -95,27 +132,22 @@ class ResumeRewriter:
         Looks for numbers, percentages, or dollar amounts.
         """
         # Check if already has quantification
-        has_number = bool(re.search(r'\d+', text))
-        has_percent = '%' in text
-        has_dollar = '$' in text
-        
-        if has_number or has_percent or has_dollar:
+        if _HAS_DIGIT_RE.search(text) or '%' in text or '$' in text:
             return text  # Already quantified
-        
+
         # Add a generic quantification placeholder
         # Insert before the last sentence or at the end
         if text.endswith('.'):
             text = text[:-1]
-        
-        # Try to add quantification naturally
-        if 'improved' in text.lower() or 'increased' in text.lower():
-            text += ', resulting in improved performance'
-        elif 'reduced' in text.lower() or 'decreased' in text.lower():
-            text += ', reducing costs and time'
-        elif 'developed' in text.lower() or 'built' in text.lower():
-            text += ', enabling scalable solutions'
+
+        # Lowercase once and reuse the copy across the keyword checks
+        text_lower = text.lower()
+        for keywords, suffix in _QUANT_SUFFIXES:
+            if any(word in text_lower for word in keywords):
+                text += suffix
+                break
         else:
-            text += ', delivering measurable impact'
+            text += _QUANT_DEFAULT
         
         if not text.endswith('.'):
             text += '.'
@@ -131,26 +163,25 @@ class ResumeRewriter:
         """
         if not bullet or len(bullet.strip()) < 10:
             return bullet
-        
-        # Clean up the bullet
-        bullet = bullet.strip()
-        
-        # Remove leading/trailing punctuation issues
-        bullet = re.sub(r'^[^\w]+', '', bullet)
-        
-        # Strengthen verb
-        bullet = self.strengthen_verb(bullet)
-        
+
+        # Clean up the bullet and drop leading punctuation
+        bullet = _LEAD_PUNCT_RE.sub('', bullet.strip(), count=1)
+
+        # Tokenize once; the verb/capitalization step works on the word
+        # list directly rather than re-splitting the string
+        words = bullet.split()
+        if not words:
+            return bullet
+        self._strengthen_verb_words(words)
+        bullet = ' '.join(words)
+
         # Add quantification if missing
         bullet = self.add_quantification(bullet)
-        
-        # Ensure proper capitalization and punctuation
-        if not bullet[0].isupper():
-            bullet = bullet[0].upper() + bullet[1:]
-        
+
+        # Ensure terminal punctuation
         if not bullet.endswith(('.', '!', '?')):
             bullet += '.'
-        
+
         return bullet
     
     def rewrite_bullets(self, resume_text: str, count: int = 3) -> List[str]:
@@ -168,8 +199,14 @@ class ResumeRewriter:
                 "Optimized processes and systems, reducing costs and time."
             ]
         
-        # Rewrite bullets
-        rewritten = [self.rewrite_bullet(bullet) for bullet in bullets[:count]]
+        # Rewrite bullets (each rewrite is independent, so large batches
+        # can fan out across threads)
+        to_rewrite = bullets[:count]
+        if len(to_rewrite) >= _PARALLEL_BULLET_THRESHOLD:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                rewritten = list(pool.map(self.rewrite_bullet, to_rewrite))
+        else:
+            rewritten = [self.rewrite_bullet(bullet) for bullet in to_rewrite]
         
         # Ensure we have exactly 'count' bullets
         while len(rewritten) < count:
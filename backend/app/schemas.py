@@ -4,6 +4,10 @@ Request/Response schemas for the ResuMate API.
 from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional
 
+# Deletion table for control characters (keeps tab and newline); built
+# once so validate_text can scrub input in a single C-level pass.
+_CTRL_TABLE = dict.fromkeys((c for c in range(32) if c not in (9, 10)), None)
+
 
 class AnalyzeRequest(BaseModel):
     """Request schema for resume-job matching analysis."""
@@ -17,8 +21,7 @@ class AnalyzeRequest(BaseModel):
         if not v or not v.strip():
             raise ValueError("Text cannot be empty")
         # Remove null bytes and control characters (except newlines and tabs)
-        cleaned = ''.join(char for char in v if ord(char) >= 32 or char in '\n\t')
-        return cleaned.strip()
+        return v.translate(_CTRL_TABLE).strip()
 
 
 class AnalyzeResponse(BaseModel):
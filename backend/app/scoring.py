@@ -2,13 +2,133 @@
 ATS-like hybrid scoring module for resume-job matching.
 Implements: K (Keyword/Skill) 55% + S (Semantic) 35% + E (Evidence) 10%
 """
+import bisect
+import hashlib
 import re
 import json
 import os
-from typing import List, Tuple, Set, Dict, Optional
-from collections import Counter
+import sys
+import threading
+from typing import List, Tuple, Set, Dict, Optional, TYPE_CHECKING
+from collections import Counter, OrderedDict
+from functools import lru_cache
 import numpy as np
-from sentence_transformers import SentenceTransformer
+
+# Annotation-only: importing sentence_transformers costs seconds, and
+# deferring it keeps `import app.scoring` cheap for tooling and tests
+# that never construct a model
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+# Aho-Corasick gives a single linear scan over the text for all skill
+# aliases at once; without it we fall back to the per-skill regex loop
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Text-normalization patterns (compiled once at import; these run on
+# every analyze call over full resume + JD text)
+_DEHYPHENATE_RE = re.compile(r'(\w+)-\s*\n\s*(\w+)')
+_INLINE_WS_RE = re.compile(r'[ \t]+')
+
+# Bullet/dash normalization as a single C-level translate pass instead
+# of two regex substitutions; the per-line whitespace normalization
+# below absorbs any spacing the old '• ' replacement added
+_BULLET_DASH_TABLE = str.maketrans({
+    '·': '•', '▪': '•', '▫': '•', '‣': '•', '⁃': '•',
+    '–': '-', '—': '-',
+})
+
+# Token pattern shared by the TF-IDF adjustment in keyword_score
+_TOKEN3_RE = re.compile(r'\b[a-zA-Z0-9]{3,}\b')
+
+# Simple stopwords filter for the TF-IDF token-overlap adjustment
+_STOPWORDS = frozenset({
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of',
+    'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'be',
+    'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did',
+    'will', 'would', 'should', 'could', 'may', 'might', 'must', 'can',
+})
+
+
+def _hashed_tokens(text: str) -> np.ndarray:
+    """
+    Unique non-stopword tokens as a sorted uint64 hash array. The
+    Jaccard adjustment only needs overlap counts, not the strings, so
+    hashing lets the set arithmetic run as NumPy array intersections
+    instead of per-element Python set operations.
+    """
+    return np.unique(np.fromiter(
+        (hash(t) & 0xFFFFFFFFFFFFFFFF
+         for t in _TOKEN3_RE.findall(text.lower())
+         if t not in _STOPWORDS),
+        dtype=np.uint64,
+    ))
+
+
+# Tokens for the short-text skill fast path: keeps the symbol-bearing
+# aliases (c++, c#, node.js, ci/cd, fast-api) intact as one token
+# while still ending on an alphanumeric/+/# so trailing punctuation
+# isn't swallowed
+_FAST_TOKEN_RE = re.compile(r'[a-z0-9](?:[a-z0-9+#./\-]*[a-z0-9+#])?')
+
+# Length below which extract_requirements uses the token fast path
+# instead of a full automaton scan
+_FAST_PATH_MAX_CHARS = 500
+
+# Word tokens with positions, for the evidence proximity scan
+_WORD_RE = re.compile(r'\w+')
+
+# Action verbs that signal a skill was actually used, not just listed
+_ACTION_VERBS = frozenset({
+    'built', 'developed', 'implemented', 'designed', 'optimized',
+    'deployed', 'migrated', 'improved', 'created', 'architected',
+    'engineered', 'delivered', 'launched', 'scaled', 'enhanced',
+})
+
+# Verb and skill count as "in context" when at most six words sit
+# between them — at most seven token positions apart — and the whole
+# chain lies in one contiguous word run: punctuation, bullet markers,
+# and line breaks end the window, so a skill that is merely listed
+# next to verb-led prose doesn't count
+_CONTEXT_WINDOW = 7
+
+# Section heading recognizer: one anchored alternation with a named
+# group per section, so each line costs a single match call and
+# m.lastgroup names the section directly
+_SECTION_HEADER_RE = re.compile(
+    r'^(?:'
+    r'(?P<SKILLS>skills?|technical\s+skills?|core\s+skills?|competencies?)'
+    r'|(?P<EXPERIENCE>experience|work\s+experience|employment|professional\s+experience|career)'
+    r'|(?P<PROJECTS>projects?|personal\s+projects?|side\s+projects?|portfolio)'
+    r'|(?P<EDUCATION>education|academic|qualifications?|degrees?)'
+    r'|(?P<CERTIFICATIONS>certifications?|certificates?|licenses?|credentials?)'
+    r')(?:\s*:|\s*$)',
+    re.IGNORECASE,
+)
+
+# Requirement-line classifiers. Fixed substrings go through str.find
+# (a C-level scan, no regex engine startup per line); only the
+# phrases with flexible whitespace keep a compiled pattern
+_MUST_HAVE_LITERALS = ('required', 'essential')
+_MUST_HAVE_RE = re.compile(
+    r'must\s+have|minimum\s+qualifications?|we\s+require|you\s+have'
+)
+_PREFERRED_LITERALS = ('preferred', 'bonus', 'plus')
+_PREFERRED_RE = re.compile(r'nice\s+to\s+have')
+
+# Metrics/impact patterns (kept separate: evidence_score counts how
+# many distinct kinds of metric appear)
+_METRICS_RES = (
+    re.compile(r'\d+\s*%'),  # Percentages
+    re.compile(r'\$\d+'),  # Dollar amounts
+    re.compile(r'\d+\s*(?:ms|milliseconds|seconds|minutes|hours)'),  # Latency
+    re.compile(r'\d+\s*(?:users|clients|customers|requests)'),  # User counts
+    re.compile(r'\d+x\s*(?:faster|improvement|increase)'),  # Multipliers
+    re.compile(r'(?:reduced|increased|improved|decreased)\s+by\s+\d+'),  # Impact phrases
+    re.compile(r'\d+\s*(?:million|billion|thousand)'),  # Large numbers
+)
 
 
 class ResumeScorer:
@@ -34,12 +154,116 @@ class ResumeScorer:
     MUST_HAVE_CAP = 70
     
     MAX_TEXT_LENGTH = 25000
+
+    # Per-segment truncation for embedding inputs
+    SEMANTIC_MAX_CHARS = 10000
     
-    def __init__(self, model: SentenceTransformer):
-        """Initialize scorer with a sentence transformer model."""
+    def __init__(self, model: "SentenceTransformer"):
+        """
+        Initialize scorer with a sentence transformer model.
+
+        Precision contract: the model may run reduced-precision weights
+        (INT8 ONNX on CPU, FP16 on GPU — see _load_bi_encoder), but
+        embeddings handed to this class are accumulated and compared in
+        float32; _encode_texts upcasts on the way into the cache.
+        """
         self.model = model
         self.skill_dict = self._load_skill_dict()
         self._alias_to_canonical = self._build_alias_map()
+        self._skill_automaton = self._build_skill_automaton()
+        # Specialized alias views for the short-text fast path:
+        # single-token aliases resolve by dict lookup, multi-token
+        # (space-containing) aliases by substring scan
+        self._single_token_aliases = {
+            alias: canonical
+            for alias, canonical in self._alias_to_canonical.items()
+            if ' ' not in alias
+        }
+        # Precomputed specificity sort keys for the canonical names:
+        # sorting matched/missing lists becomes a dict lookup per
+        # element instead of a len()+lower()+tuple per comparison
+        self._sort_key = {
+            canonical: (-len(canonical), canonical)
+            for canonical in set(self._alias_to_canonical.values())
+        }
+        self._multi_token_aliases = sorted(
+            ((alias, canonical)
+             for alias, canonical in self._alias_to_canonical.items()
+             if ' ' in alias),
+            key=lambda item: -len(item[0]),
+        )
+        # Content-keyed caches: the same resume is scored against many
+        # JDs (and vice versa) in typical use, and both the embedding
+        # and the skill scan depend only on the text. Instance-bound so
+        # the caches die with the scorer.
+        self._emb_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        # score_match runs on worker threads (asyncio.to_thread in the
+        # API layer), so all OrderedDict reads/mutations happen under
+        # this lock; only the encoder forward pass runs outside it
+        self._emb_cache_lock = threading.Lock()
+        self._extract_skills_cached = lru_cache(maxsize=128)(self._extract_skills_default)
+
+    _EMB_CACHE_SIZE = 128
+
+    @staticmethod
+    def _text_key(text: str) -> bytes:
+        """Compact cache key so the cache doesn't pin 25k-char texts."""
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    def _encode_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts through the embedding cache: hits are returned
+        directly, misses are batch-encoded in one forward pass. Returns
+        the stacked (len(texts), dim) matrix in input order.
+        """
+        keys = [self._text_key(t) for t in texts]
+        # Grab hit rows (and refresh their LRU position) in one locked
+        # pass; the row references stay valid even if a concurrent
+        # insert evicts the entries afterwards
+        with self._emb_cache_lock:
+            rows = []
+            for k in keys:
+                row = self._emb_cache.get(k)
+                if row is not None:
+                    self._emb_cache.move_to_end(k)
+                rows.append(row)
+        miss = [i for i, row in enumerate(rows) if row is None]
+        if miss:
+            encoded = self.model.encode(
+                [texts[i] for i in miss],
+                batch_size=len(miss),
+                convert_to_numpy=True,
+                normalize_embeddings=False,
+                show_progress_bar=False
+            )
+            encoded = encoded.astype(np.float32, copy=False)
+            # Normalize the whole batch in one vectorized pass rather
+            # than per-row inside the encoder; cached rows are unit
+            # length, so downstream dot products stay cosine sims
+            norms = np.linalg.norm(encoded, axis=1, keepdims=True)
+            np.divide(encoded, np.maximum(norms, 1e-12), out=encoded)
+            with self._emb_cache_lock:
+                for row, i in zip(encoded, miss):
+                    rows[i] = row
+                    self._emb_cache[keys[i]] = row
+                    if len(self._emb_cache) > self._EMB_CACHE_SIZE:
+                        self._emb_cache.popitem(last=False)
+        return np.stack(rows)
+
+    def _build_skill_automaton(self):
+        """
+        Build one Aho-Corasick automaton over every canonical name and
+        alias, so extract_skills is a single linear scan instead of a
+        regex search per skill entry. Returns None when pyahocorasick
+        isn't installed (extract_skills then uses the regex loop).
+        """
+        if ahocorasick is None or not self._alias_to_canonical:
+            return None
+        automaton = ahocorasick.Automaton()
+        for alias, canonical in self._alias_to_canonical.items():
+            automaton.add_word(alias, (len(alias), canonical))
+        automaton.make_automaton()
+        return automaton
     
     def _load_skill_dict(self) -> Dict[str, List[str]]:
         """Load skills dictionary from JSON file."""
@@ -56,11 +280,13 @@ class ResumeScorer:
         """Build mapping from aliases to canonical skill names."""
         alias_map = {}
         for canonical, aliases in self.skill_dict.items():
-            # Store canonical as lowercase for consistency
-            canonical_lower = canonical.lower()
+            # Store canonical as lowercase for consistency; interned so
+            # the skill sets score_match intersects and subtracts can
+            # short-circuit on pointer equality instead of rehashing
+            canonical_lower = sys.intern(canonical.lower())
             alias_map[canonical_lower] = canonical_lower  # Store as lowercase
             for alias in aliases:
-                alias_map[alias.lower()] = canonical_lower
+                alias_map[sys.intern(alias.lower())] = canonical_lower
         return alias_map
     
     def clean_text(self, text: str) -> Tuple[str, bool]:
@@ -76,32 +302,31 @@ class ResumeScorer:
             text = text[:self.MAX_TEXT_LENGTH]
             was_truncated = True
         
-        # Normalize various bullet characters to standard bullet
-        text = re.sub(r'[•·▪▫‣⁃]\s*', '• ', text)
-        
-        # Normalize various dashes/hyphens
-        text = re.sub(r'[–—]\s*', '- ', text)
-        
+        # Normalize bullet characters and dashes in one pass
+        text = text.translate(_BULLET_DASH_TABLE)
+
         # De-hyphenate line breaks (e.g., "devel-\nop" -> "develop")
-        text = re.sub(r'(\w+)-\s*\n\s*(\w+)', r'\1\2', text)
+        text = _DEHYPHENATE_RE.sub(r'\1\2', text)
         
         # Normalize whitespace (but preserve intentional line breaks)
         lines = text.split('\n')
         cleaned_lines = []
         for line in lines:
             # Normalize spaces within line
-            line = re.sub(r'[ \t]+', ' ', line.strip())
+            line = _INLINE_WS_RE.sub(' ', line.strip())
             if line:
                 cleaned_lines.append(line)
         
-        # Remove repeated header/footer lines (frequency-based)
+        # Remove repeated header/footer lines (frequency-based). Only
+        # short lines can be headers/footers, so count just those and
+        # test membership in the drop set — one predicate per line
+        # instead of a Counter over full-length body text
         if len(cleaned_lines) > 10:
-            line_counts = Counter(cleaned_lines)
+            line_counts = Counter(line for line in cleaned_lines if len(line) < 80)
             # Remove lines appearing >= 3 times and shorter than ~80 chars
-            cleaned_lines = [
-                line for line in cleaned_lines
-                if not (line_counts[line] >= 3 and len(line) < 80)
-            ]
+            drop = {line for line, count in line_counts.items() if count >= 3}
+            if drop:
+                cleaned_lines = [line for line in cleaned_lines if line not in drop]
         
         return '\n'.join(cleaned_lines), was_truncated
     
@@ -119,15 +344,6 @@ class ResumeScorer:
             'OTHER': ''
         }
         
-        # Section heading patterns (case-insensitive)
-        section_patterns = {
-            'SKILLS': r'^(skills?|technical\s+skills?|core\s+skills?|competencies?)(\s*:|\s*$|$)',
-            'EXPERIENCE': r'^(experience|work\s+experience|employment|professional\s+experience|career)(\s*:|\s*$|$)',
-            'PROJECTS': r'^(projects?|personal\s+projects?|side\s+projects?|portfolio)(\s*:|\s*$|$)',
-            'EDUCATION': r'^(education|academic|qualifications?|degrees?)(\s*:|\s*$|$)',
-            'CERTIFICATIONS': r'^(certifications?|certificates?|licenses?|credentials?)(\s*:|\s*$|$)'
-        }
-        
         lines = resume_text.split('\n')
         current_section = 'OTHER'
         current_content = []
@@ -141,12 +357,9 @@ class ResumeScorer:
                 continue
             
             # Check if this line is a section header
-            matched_section = None
-            for section_name, pattern in section_patterns.items():
-                if re.match(pattern, line_stripped, re.IGNORECASE):
-                    matched_section = section_name
-                    break
-            
+            m = _SECTION_HEADER_RE.match(line_stripped)
+            matched_section = m.lastgroup if m else None
+
             if matched_section:
                 # Save previous section content
                 if current_content:
@@ -163,24 +376,92 @@ class ResumeScorer:
         
         return sections
     
+    @staticmethod
+    def _is_word_char(ch: str) -> bool:
+        """Word-character test matching the regex \\b definition."""
+        return ch.isalnum() or ch == '_'
+
     def extract_skills(self, text: str, skill_dict: Optional[Dict] = None) -> Set[str]:
         """
         Extract skills using dictionary and aliases.
-        Matches multi-word phrases first, then single tokens with word boundaries.
+        Matches every canonical name and alias with word boundaries.
         Returns set of canonical skill names (lowercase).
+
+        The default skill dictionary is matched through a prebuilt
+        Aho-Corasick automaton — one linear scan over the text instead
+        of a regex search per skill entry — with boundary checks on
+        each hit, and results are memoized per text. A caller-supplied
+        skill_dict (or a missing pyahocorasick) takes the regex loop.
+
+        Callers must treat the returned set as read-only: cache hits
+        return the same object.
         """
+        # Empty/blank text can't match anything; skip the scan entirely
+        # (hit every request when a JD has no "preferred" lines)
+        if not text.strip():
+            return set()
+
         if skill_dict is None:
-            skill_dict = self.skill_dict
-        
+            return self._extract_skills_cached(text)
+
+        return self._extract_skills_regex(text, skill_dict)
+
+    def _extract_skills_default(self, text: str) -> Set[str]:
+        """Uncached default-dictionary extraction backing the LRU."""
+        if self._skill_automaton is not None:
+            return self._extract_skills_automaton(text)
+        return self._extract_skills_regex(text, self.skill_dict)
+
+    def extract_skills_fast(self, text: str) -> Set[str]:
+        """
+        Short-text specialization of extract_skills: dict lookups over
+        tokens for single-token aliases plus a substring scan for the
+        few multi-token ones, skipping automaton setup entirely. Used
+        by extract_requirements on individual requirement lines, where
+        the fixed cost of a full-text scan dominates.
+        """
+        if not text or not text.strip():
+            return set()
+        text_lower = text.lower()
+        single = self._single_token_aliases
+        found = set()
+        for token in _FAST_TOKEN_RE.findall(text_lower):
+            canonical = single.get(token)
+            if canonical:
+                found.add(canonical)
+            if '-' in token or '/' in token or '.' in token:
+                # The automaton also matches aliases embedded in
+                # hyphen/slash/dot compounds ("react-native", "node.js")
+                for piece in re.split(r'[-/.]', token):
+                    canonical = single.get(piece)
+                    if canonical:
+                        found.add(canonical)
+        last = len(text_lower) - 1
+        for alias, canonical in self._multi_token_aliases:
+            if canonical in found:
+                continue
+            idx = text_lower.find(alias)
+            while idx != -1:
+                end = idx + len(alias) - 1
+                if (idx == 0 or not self._is_word_char(text_lower[idx - 1])) and \
+                        (end >= last or not self._is_word_char(text_lower[end + 1])
+                         or not self._is_word_char(text_lower[end])):
+                    found.add(canonical)
+                    break
+                idx = text_lower.find(alias, idx + 1)
+        return found
+
+    def _extract_skills_regex(self, text: str, skill_dict: Dict) -> Set[str]:
+        """Per-skill regex extraction for caller-supplied dictionaries."""
         if not skill_dict:
             return set()
-        
+
         text_lower = text.lower()
         found_skills = set()
-        
+
         # Sort by length (longest first) to match multi-word phrases first
         sorted_skills = sorted(skill_dict.items(), key=lambda x: (-len(x[0]), x[0]))
-        
+
         for canonical, aliases in sorted_skills:
             canonical_lower = canonical.lower()
             
@@ -207,43 +488,54 @@ class ResumeScorer:
                 if re.search(pattern, text_lower):
                     found_skills.add(canonical_lower)
                     break
-        
+
         return found_skills
-    
-    def extract_requirements(self, job_text: str) -> Tuple[Set[str], Set[str]]:
+
+    def _extract_skills_automaton(self, text: str) -> Set[str]:
+        """One-pass skill extraction over the prebuilt automaton."""
+        text_lower = text.lower()
+        found_skills = set()
+        last = len(text_lower) - 1
+        for end, (alias_len, canonical) in self._skill_automaton.iter(text_lower):
+            if canonical in found_skills:
+                continue
+            # Emulate \b on both edges of the hit. This also matches
+            # symbol-edged aliases like 'c++' followed by a space, which
+            # the regex \b (needing a word char on one side) missed.
+            start = end - alias_len + 1
+            if start > 0 and self._is_word_char(text_lower[start - 1]):
+                continue
+            if end < last and self._is_word_char(text_lower[end + 1]) \
+                    and self._is_word_char(text_lower[end]):
+                continue
+            found_skills.add(canonical)
+        return found_skills
+
+    def extract_requirements(self, job_text: str,
+                             all_jd_skills: Optional[Set[str]] = None) -> Tuple[Set[str], Set[str]]:
         """
         Extract must-have and preferred requirements from job description.
+        When the caller already holds the full-JD skill set, passing it
+        lets an empty JD short-circuit the per-line scans entirely.
         Returns: (must_have_skills, preferred_skills)
         """
+        if all_jd_skills is not None and not all_jd_skills:
+            return set(), set()
+
         lines = job_text.split('\n')
         must_have_lines = []
         preferred_lines = []
-        
-        # Patterns for must-have
-        must_have_patterns = [
-            r'required',
-            r'must\s+have',
-            r'minimum\s+qualifications?',
-            r'we\s+require',
-            r'you\s+have',
-            r'essential'
-        ]
-        
-        # Patterns for preferred
-        preferred_patterns = [
-            r'preferred',
-            r'bonus',
-            r'nice\s+to\s+have',
-            r'plus'
-        ]
-        
+
         for line in lines:
             line_lower = line.lower()
-            # Check for must-have patterns
-            if any(re.search(pattern, line_lower) for pattern in must_have_patterns):
+            # Check for must-have patterns (literals first, regex only
+            # for the whitespace-flexible phrases)
+            if any(lit in line_lower for lit in _MUST_HAVE_LITERALS) \
+                    or _MUST_HAVE_RE.search(line_lower):
                 must_have_lines.append(line)
             # Check for preferred patterns
-            elif any(re.search(pattern, line_lower) for pattern in preferred_patterns):
+            elif any(lit in line_lower for lit in _PREFERRED_LITERALS) \
+                    or _PREFERRED_RE.search(line_lower):
                 preferred_lines.append(line)
         
         # If no explicit must-have section found, check first 500 chars
@@ -254,21 +546,36 @@ class ResumeScorer:
         
         preferred_text = ' '.join(preferred_lines) if preferred_lines else ''
         
-        # Extract skills from each
-        must_have_skills = self.extract_skills(must_have_text)
-        preferred_skills = self.extract_skills(preferred_text)
+        # Extract skills from each; requirement lines are short, so
+        # prefer the token fast path over a full automaton scan
+        must_have_skills = (
+            self.extract_skills_fast(must_have_text)
+            if len(must_have_text) < _FAST_PATH_MAX_CHARS
+            else self.extract_skills(must_have_text)
+        )
+        preferred_skills = (
+            self.extract_skills_fast(preferred_text)
+            if len(preferred_text) < _FAST_PATH_MAX_CHARS
+            else self.extract_skills(preferred_text)
+        )
         
         return must_have_skills, preferred_skills
     
-    def keyword_score(self, resume_text: str, job_text: str, 
-                     must_have: Set[str], preferred: Set[str]) -> float:
+    def keyword_score(self, resume_text: str, job_text: str,
+                     must_have: Set[str], preferred: Set[str],
+                     resume_skills: Optional[Set[str]] = None,
+                     all_jd_skills: Optional[Set[str]] = None) -> float:
         """
         Calculate keyword/skill score K using weighted recall-style scoring.
+        Accepts pre-extracted skill sets so score_match doesn't extract
+        the same texts twice.
         Returns score 0-100.
         """
-        # Extract all skills
-        resume_skills = self.extract_skills(resume_text)
-        all_jd_skills = self.extract_skills(job_text)
+        # Extract all skills (unless the caller already has them)
+        if resume_skills is None:
+            resume_skills = self.extract_skills(resume_text)
+        if all_jd_skills is None:
+            all_jd_skills = self.extract_skills(job_text)
         other_jd_skills = all_jd_skills - must_have - preferred
         
         # Weighted recall-style scoring
@@ -299,20 +606,15 @@ class ResumeScorer:
         else:
             K = 0.0
         
-        # Add TF-IDF adjustment (+/- up to 10 points)
-        resume_tokens = set(re.findall(r'\b[a-zA-Z0-9]{3,}\b', resume_text.lower()))
-        job_tokens = set(re.findall(r'\b[a-zA-Z0-9]{3,}\b', job_text.lower()))
-        
-        # Simple stopwords filter
-        stopwords = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'should', 'could', 'may', 'might', 'must', 'can'}
-        resume_tokens = {t for t in resume_tokens if t not in stopwords and len(t) >= 3}
-        job_tokens = {t for t in job_tokens if t not in stopwords and len(t) >= 3}
-        
-        # Jaccard similarity
-        if job_tokens:
-            intersection = resume_tokens & job_tokens
-            union = resume_tokens | job_tokens
-            jaccard = len(intersection) / len(union) if union else 0.0
+        # Add TF-IDF adjustment (+/- up to 10 points): Jaccard overlap
+        # of hashed tokens, computed with array intersections
+        resume_hashes = _hashed_tokens(resume_text)
+        job_hashes = _hashed_tokens(job_text)
+
+        if job_hashes.size:
+            inter = np.intersect1d(resume_hashes, job_hashes, assume_unique=True).size
+            union = resume_hashes.size + job_hashes.size - inter
+            jaccard = inter / union if union else 0.0
         else:
             jaccard = 0.0
         
@@ -323,130 +625,205 @@ class ResumeScorer:
         
         return round(K, 1)
     
-    def semantic_score(self, resume_text: str, job_text: str, sections: Dict[str, str]) -> float:
+    def semantic_score(self, resume_text: str, job_text: str, sections: Dict[str, str],
+                       job_embedding: Optional[np.ndarray] = None) -> float:
         """
         Calculate semantic similarity using embeddings.
         Weighted combination of whole resume, experience, and projects.
+        Accepts a precomputed (normalized) JD embedding so loops over
+        many resumes for one job skip re-encoding the JD side.
         Returns score 0-100.
         """
-        max_chars = 10000
-        
-        # Whole resume vs JD
-        resume_truncated = resume_text[:max_chars] if len(resume_text) > max_chars else resume_text
-        job_truncated = job_text[:max_chars] if len(job_text) > max_chars else job_text
-        
-        try:
-            whole_embedding = self.model.encode(resume_truncated, convert_to_numpy=True, normalize_embeddings=True)
-            job_embedding = self.model.encode(job_truncated, convert_to_numpy=True, normalize_embeddings=True)
-            whole_sim = float(np.dot(whole_embedding, job_embedding))
-        except Exception as e:
-            print(f"Embedding calculation error: {e}")
-            whole_sim = 0.0
-        
-        # Experience section vs JD
+        max_chars = self.SEMANTIC_MAX_CHARS
+
+        # Collect whole resume + present sections + JD into one list so
+        # the encoder runs a single padded forward pass (cache misses
+        # only), mirroring the premium pipeline's batched retrieval
+        texts = [resume_text[:max_chars]]
+        exp_idx = proj_idx = 0
         exp_text = sections.get('EXPERIENCE', '').strip()
-        exp_sim = 0.0
         if exp_text:
-            exp_truncated = exp_text[:max_chars] if len(exp_text) > max_chars else exp_text
-            try:
-                exp_embedding = self.model.encode(exp_truncated, convert_to_numpy=True, normalize_embeddings=True)
-                exp_sim = float(np.dot(exp_embedding, job_embedding))
-            except Exception:
-                exp_sim = 0.0
-        
-        # Projects section vs JD
+            exp_idx = len(texts)
+            texts.append(exp_text[:max_chars])
         proj_text = sections.get('PROJECTS', '').strip()
-        proj_sim = 0.0
         if proj_text:
-            proj_truncated = proj_text[:max_chars] if len(proj_text) > max_chars else proj_text
-            try:
-                proj_embedding = self.model.encode(proj_truncated, convert_to_numpy=True, normalize_embeddings=True)
-                proj_sim = float(np.dot(proj_embedding, job_embedding))
-            except Exception:
-                proj_sim = 0.0
-        
+            proj_idx = len(texts)
+            texts.append(proj_text[:max_chars])
+        try:
+            if job_embedding is None:
+                texts.append(job_text[:max_chars])
+                embs = self._encode_texts(texts)
+                job_embedding = embs[-1]
+                embs = embs[:-1]
+            else:
+                embs = self._encode_texts(texts)
+            # One gemv against the JD row covers every section at once
+            sims = embs @ job_embedding
+        except Exception as e:
+            print(f"Embedding calculation error: {e}")
+            return 0.0
+
+        whole_sim = float(sims[0])
+        # Absent sections fall back to the whole-resume similarity, which
+        # reproduces the old weight-redistribution behaviour exactly
+        exp_sim = float(sims[exp_idx])
+        proj_sim = float(sims[proj_idx])
+
         # Weighted combination
-        # whole: 0.4, experience: 0.4 (if present), projects: 0.2 (if present)
-        total_weight = 0.4
-        weighted_sum = 0.4 * whole_sim
-        
-        if exp_text:
-            weighted_sum += 0.4 * exp_sim
-            total_weight += 0.4
-        else:
-            # Redistribute experience weight to whole
-            weighted_sum += 0.4 * whole_sim
-            total_weight += 0.4
-        
-        if proj_text:
-            weighted_sum += 0.2 * proj_sim
-            total_weight += 0.2
-        else:
-            # Redistribute projects weight
-            weighted_sum += 0.2 * whole_sim
-            total_weight += 0.2
-        
-        # Normalize and scale to 0-100
-        if total_weight > 0:
-            S = 100 * (weighted_sum / total_weight)
-        else:
-            S = 0.0
-        
+        # whole: 0.4, experience: 0.4, projects: 0.2 (weights sum to 1,
+        # so no renormalization step is needed)
+        S = 100 * (0.4 * whole_sim + 0.4 * exp_sim + 0.2 * proj_sim)
+
         return max(0, min(100, round(S, 1)))
     
+    def score_batch(self, resumes: List[str], job_text: str) -> List[Dict]:
+        """
+        Score many resumes against one job description.
+
+        Encodes the JD once, then warms the embedding cache with every
+        resume segment (whole/experience/projects) in length-sorted
+        batches of 32 — sorting keeps similarly sized texts together so
+        each padded batch wastes little work. The per-resume
+        score_match calls then hit the cache instead of issuing their
+        own batch-of-few encodes, and return exactly the same dicts as
+        calling score_match in a loop.
+        """
+        max_chars = self.SEMANTIC_MAX_CHARS
+        segments = []
+        for resume in resumes:
+            resume_clean, _ = self.clean_text(resume)
+            sections = self.split_sections(resume_clean)
+            segments.append(resume_clean[:max_chars])
+            for key in ('EXPERIENCE', 'PROJECTS'):
+                section_text = sections.get(key, '').strip()
+                if section_text:
+                    segments.append(section_text[:max_chars])
+
+        job_clean, _ = self.clean_text(job_text)
+        segments.append(job_clean[:max_chars])
+
+        segments.sort(key=len)
+        try:
+            for i in range(0, len(segments), 32):
+                self._encode_texts(segments[i:i + 32])
+        except Exception as e:
+            # score_match degrades gracefully without warm embeddings
+            print(f"Batch embedding warmup error: {e}")
+
+        return [self.score_match(resume, job_text) for resume in resumes]
+
     def evidence_score(self, resume_text: str) -> float:
         """
         Calculate evidence score E (0-100).
         Rewards skills used in context and measurable impact.
         """
         text_lower = resume_text.lower()
+
+        # Skills appearing within six words of an action verb
+        context_hits = self._context_hits(text_lower)
+
+        metrics_hits = 0
+        for pattern in _METRICS_RES:
+            if pattern.search(text_lower):
+                metrics_hits += 1
         
-        # Action verbs near skills
-        action_verbs = [
-            'built', 'developed', 'implemented', 'designed', 'optimized',
-            'deployed', 'migrated', 'improved', 'created', 'architected',
-            'engineered', 'delivered', 'launched', 'scaled', 'enhanced'
-        ]
+        # Calculate E: min(60, context_hits*10) + min(40, metrics_hits*10)
+        context_score = min(60, context_hits * 10)
+        metrics_score = min(40, metrics_hits * 10)
+        E = max(0, min(100, context_score + metrics_score))
         
+        return round(E, 1)
+    
+    def _context_hits(self, text_lower: str) -> int:
+        """
+        Count skills that appear within six words of an action verb.
+
+        One tokenize pass records token start offsets, verb token
+        positions, and a segment id per token — a segment being a
+        contiguous run of words separated only by spaces/tabs, so
+        punctuation and line breaks start a new one. Skill occurrences
+        come from the same Aho-Corasick automaton extract_skills uses,
+        with char offsets mapped back to token indices by bisecting the
+        start array and an O(log V) nearest-verb lookup per occurrence;
+        a verb only counts when it shares the skill's segment, so the
+        window never reaches across a comma-separated list or into an
+        adjacent line. This replaces the old 2 x |verbs| x |skills|
+        regex searches over the full text. Falls back to the regex loop
+        when pyahocorasick isn't installed.
+        """
+        if self._skill_automaton is None:
+            return self._context_hits_regex(text_lower)
+
+        token_starts = []
+        token_segments = []
+        verb_positions = []
+        seg = 0
+        prev_end = 0
+        for i, m in enumerate(_WORD_RE.finditer(text_lower)):
+            # Anything but spaces/tabs between tokens ends the word run
+            if i and text_lower[prev_end:m.start()].strip(' \t'):
+                seg += 1
+            prev_end = m.end()
+            token_starts.append(m.start())
+            token_segments.append(seg)
+            if m.group() in _ACTION_VERBS:
+                verb_positions.append(i)
+        if not verb_positions:
+            return 0
+
+        last = len(text_lower) - 1
+        hits = set()
+        for end, (length, canonical) in self._skill_automaton.iter(text_lower):
+            if canonical in hits:
+                continue
+            start = end - length + 1
+            # Same word-boundary emulation as _extract_skills_automaton
+            if start > 0 and self._is_word_char(text_lower[start - 1]):
+                continue
+            if end < last and self._is_word_char(text_lower[end + 1]) \
+                    and self._is_word_char(text_lower[end]):
+                continue
+            # First and last token the skill occurrence spans (they can
+            # differ for multi-word aliases)
+            tok_start = max(0, bisect.bisect_right(token_starts, start) - 1)
+            tok_end = max(0, bisect.bisect_right(token_starts, end) - 1)
+            # Nearest verb after the skill
+            j = bisect.bisect_left(verb_positions, tok_end)
+            if j < len(verb_positions):
+                v = verb_positions[j]
+                if v - tok_end <= _CONTEXT_WINDOW \
+                        and token_segments[v] == token_segments[tok_end]:
+                    hits.add(canonical)
+                    continue
+            # Nearest verb before the skill
+            j = bisect.bisect_right(verb_positions, tok_start)
+            if j > 0:
+                v = verb_positions[j - 1]
+                if tok_start - v <= _CONTEXT_WINDOW \
+                        and token_segments[v] == token_segments[tok_start]:
+                    hits.add(canonical)
+        return len(hits)
+
+    def _context_hits_regex(self, text_lower: str) -> int:
+        """
+        Regex fallback: verb-within-6-words pattern per skill. Word
+        separators are spaces/tabs only, matching the automaton path's
+        segment rule (punctuation and line breaks end the window).
+        """
         context_hits = 0
-        # Look for action verbs within +/- 6 words of canonical skills
         for canonical in self.skill_dict.keys():
             canonical_lower = canonical.lower()
-            # Create pattern: action verb within 6 words of skill
             found_context = False
-            for verb in action_verbs:
-                # Pattern: verb ... (up to 6 words) ... skill OR skill ... (up to 6 words) ... verb
-                pattern1 = rf'\b{verb}\b\s+(?:\w+\s+){{0,6}}\b{re.escape(canonical_lower)}\b'
-                pattern2 = rf'\b{re.escape(canonical_lower)}\b\s+(?:\w+\s+){{0,6}}\b{verb}\b'
+            for verb in _ACTION_VERBS:
+                pattern1 = rf'\b{verb}\b[ \t]+(?:\w+[ \t]+){{0,6}}\b{re.escape(canonical_lower)}\b'
+                pattern2 = rf'\b{re.escape(canonical_lower)}\b[ \t]+(?:\w+[ \t]+){{0,6}}\b{verb}\b'
                 if re.search(pattern1, text_lower) or re.search(pattern2, text_lower):
                     found_context = True
                     break  # Count each skill once
             if found_context:
                 context_hits += 1
-        
-        # Metrics/impact patterns
-        metrics_patterns = [
-            r'\d+\s*%',  # Percentages
-            r'\$\d+',  # Dollar amounts
-            r'\d+\s*(?:ms|milliseconds|seconds|minutes|hours)',  # Latency
-            r'\d+\s*(?:users|clients|customers|requests)',  # User counts
-            r'\d+x\s*(?:faster|improvement|increase)',  # Multipliers
-            r'(?:reduced|increased|improved|decreased)\s+by\s+\d+',  # Impact phrases
-            r'\d+\s*(?:million|billion|thousand)',  # Large numbers
-        ]
-        
-        metrics_hits = 0
-        for pattern in metrics_patterns:
-            if re.search(pattern, text_lower):
-                metrics_hits += 1
-        
-        # Calculate E: min(60, context_hits*10) + min(40, metrics_hits*10)
-        context_score = min(60, context_hits * 10)
-        metrics_score = min(40, metrics_hits * 10)
-        E = max(0, min(100, context_score + metrics_score))
-        
-        return round(E, 1)
-    
+        return context_hits
+
     def score_match(self, resume_text: str, job_text: str) -> Dict:
         """
         Calculate comprehensive ATS-like hybrid match score.
@@ -459,11 +836,18 @@ class ResumeScorer:
         # Split resume into sections
         sections = self.split_sections(resume_clean)
         
+        # Extract skills once and thread the sets through
+        # extract_requirements, keyword_score, and the cap/penalty +
+        # matched/missing logic below
+        resume_skills = self.extract_skills(resume_clean)
+        all_jd_skills = self.extract_skills(job_clean)
+
         # Extract requirements
-        must_have_skills, preferred_skills = self.extract_requirements(job_clean)
-        
+        must_have_skills, preferred_skills = self.extract_requirements(job_clean, all_jd_skills)
+
         # Calculate component scores
-        K = self.keyword_score(resume_clean, job_clean, must_have_skills, preferred_skills)
+        K = self.keyword_score(resume_clean, job_clean, must_have_skills, preferred_skills,
+                               resume_skills=resume_skills, all_jd_skills=all_jd_skills)
         S = self.semantic_score(resume_clean, job_clean, sections)
         E = self.evidence_score(resume_clean)
         
@@ -471,7 +855,6 @@ class ResumeScorer:
         raw = (K * self.KEYWORD_WEIGHT) + (S * self.SEMANTIC_WEIGHT) + (E * self.EVIDENCE_WEIGHT)
         
         # Apply cap and penalty
-        resume_skills = self.extract_skills(resume_clean)
         missing_must_have = must_have_skills - resume_skills
         missing_count = len(missing_must_have)
         
@@ -481,7 +864,6 @@ class ResumeScorer:
         final = max(0, min(100, min(raw, cap) - must_have_penalty))
         
         # Extract matched and missing skills
-        all_jd_skills = self.extract_skills(job_clean)
         matched_skills = resume_skills & all_jd_skills
         missing_skills = all_jd_skills - resume_skills
         preferred_missing = preferred_skills - resume_skills
@@ -492,16 +874,16 @@ class ResumeScorer:
         preferred_matched = resume_skills & preferred_skills
         other_matched = matched_skills - must_have_skills - preferred_skills
         
-        top_matches.extend(sorted(must_have_matched, key=lambda x: (-len(x), x.lower())))
-        top_matches.extend(sorted(preferred_matched, key=lambda x: (-len(x), x.lower())))
-        top_matches.extend(sorted(other_matched, key=lambda x: (-len(x), x.lower())))
+        top_matches.extend(sorted(must_have_matched, key=self._sort_key.__getitem__))
+        top_matches.extend(sorted(preferred_matched, key=self._sort_key.__getitem__))
+        top_matches.extend(sorted(other_matched, key=self._sort_key.__getitem__))
         top_matches = top_matches[:10]
         
         # Prioritize missing: must-have first, then preferred, then others
         missing_keywords = []
-        missing_keywords.extend(sorted(missing_must_have, key=lambda x: (-len(x), x.lower())))
-        missing_keywords.extend(sorted(preferred_missing, key=lambda x: (-len(x), x.lower())))
-        missing_keywords.extend(sorted(missing_skills - must_have_skills - preferred_skills, key=lambda x: (-len(x), x.lower())))
+        missing_keywords.extend(sorted(missing_must_have, key=self._sort_key.__getitem__))
+        missing_keywords.extend(sorted(preferred_missing, key=self._sort_key.__getitem__))
+        missing_keywords.extend(sorted(missing_skills - must_have_skills - preferred_skills, key=self._sort_key.__getitem__))
         missing_keywords = missing_keywords[:10]
         
         return {
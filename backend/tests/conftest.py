@@ -0,0 +1,159 @@
+"""
+Shared fixtures for the backend test suite.
+
+The SentenceTransformer load dominates test wall time, so the model —
+and the scorers built on it, which tests only read — are session-scoped
+and created exactly once per pytest run instead of once per test file.
+The model's encode is additionally wrapped in a content-keyed cache:
+the tests reuse a small corpus of literal resume/job strings, and
+embeddings are deterministic, so identical texts across test files cost
+one forward pass for the whole session.
+"""
+import hashlib
+import os
+
+import numpy as np
+import pytest
+
+# Keep HF tokenizer thread pools quiet and avoid thread oversubscription
+# when xdist fans test files out across worker processes
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+from app.scoring import ResumeScorer
+from app.premium_scoring import PremiumScorer
+
+
+def _cache_encode(model):
+    """Wrap model.encode with a per-text cache keyed on content hash."""
+    raw_encode = model.encode
+    cache = {}
+
+    def _key(text, normalize):
+        digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+        return digest, bool(normalize)
+
+    def cached_encode(sentences, **kwargs):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        normalize = kwargs.get('normalize_embeddings', False)
+        keys = [_key(t, normalize) for t in texts]
+        miss = [i for i, k in enumerate(keys) if k not in cache]
+        if miss:
+            # Smart batching: group similar-length texts so each padded
+            # batch wastes little work; rows map back through `miss`,
+            # so encode order doesn't matter
+            miss.sort(key=lambda i: len(texts[i]))
+            kwargs['convert_to_numpy'] = True
+            kwargs.setdefault('batch_size', 32)
+            encoded = raw_encode([texts[i] for i in miss], **kwargs)
+            for row, i in zip(encoded, miss):
+                cache[keys[i]] = row
+        # Copies, so in-place math in the code under test can't corrupt
+        # cached rows
+        rows = [cache[k].copy() for k in keys]
+        return rows[0] if single else np.stack(rows)
+
+    model.encode = cached_encode
+    return model
+
+
+# Short literals reused across several test files; pre-encoding them in
+# one batched pass warms the cache so each test's first encode isn't a
+# cold batch-of-one. The longer multiline resumes/JDs are each used by
+# a single test, so enumerating them here would buy nothing beyond the
+# per-text cache.
+_WARMUP_TEXTS = (
+    "Python developer",
+    "Looking for Python developer",
+    "Software engineer with Python and JavaScript experience",
+    "Looking for a Python developer with web development skills",
+)
+
+
+def _load_model():
+    """
+    Load the test model. With RESUMATE_FAST_TESTS set, prefer the INT8
+    ONNX weights the production loader uses — the suite validates score
+    ranges and pipeline behaviour, not model fidelity, and the
+    quantized encoder is ~3x faster on CPU. Falls back to the standard
+    PyTorch backend when the ONNX extras aren't installed.
+
+    torch and sentence_transformers are imported here, not at module
+    top: they cost seconds to import, and deferring them keeps test
+    collection (and model-free tests) fast.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    if os.getenv("RESUMATE_FAST_TESTS"):
+        try:
+            return SentenceTransformer(
+                'all-MiniLM-L6-v2',
+                backend='onnx',
+                model_kwargs={
+                    'file_name': 'onnx/model_qint8_avx512_vnni.onnx',
+                    'provider': 'CPUExecutionProvider',
+                },
+            )
+        except Exception:
+            pass
+    model = SentenceTransformer('all-MiniLM-L6-v2')
+    # Inference-only setup: eval mode, no autograd bookkeeping
+    model.eval()
+    for param in model.parameters():
+        param.requires_grad_(False)
+    return model
+
+
+@pytest.fixture(scope="session")
+def model():
+    """Load model once for the whole session, with cached encode."""
+    import torch
+
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        # One torch thread per xdist worker by default: the workers
+        # already saturate the cores, intra-op parallelism just
+        # thrashes. Overridable for machines with cores to spare.
+        torch.set_num_threads(int(os.getenv("RESUMATE_TORCH_THREADS", "1")))
+    # The suite never trains; disabling grad session-wide drops the
+    # autograd bookkeeping from every forward pass
+    torch.set_grad_enabled(False)
+    model = _cache_encode(_load_model())
+    # One batched pass per normalize flag (both appear in the code
+    # under test, and the flag is part of the cache key)
+    for normalize in (True, False):
+        model.encode(list(_WARMUP_TEXTS), batch_size=32,
+                     normalize_embeddings=normalize, show_progress_bar=False)
+    return model
+
+
+@pytest.fixture(scope="session")
+def scorer(model):
+    """Create scorer instance."""
+    return ResumeScorer(model)
+
+
+@pytest.fixture(scope="session")
+def classic_scorer(scorer):
+    """Alias used by the premium scoring tests."""
+    return scorer
+
+
+class StubCrossEncoder:
+    """
+    Deterministic stand-in for the cross-encoder. The premium tests
+    assert score ranges and weighted combinations, not rerank quality,
+    and the real model is the heaviest load plus N-pair inference in
+    the suite. Integration coverage with the real reranker lives in a
+    slow-marked test that builds its own PremiumScorer.
+    """
+
+    def predict(self, pairs, **kwargs):
+        return np.full(len(pairs), 0.5, dtype=np.float32)
+
+
+@pytest.fixture(scope="session")
+def premium_scorer(model, classic_scorer):
+    """Create premium scorer instance with a stubbed reranker model."""
+    scorer = PremiumScorer(model, classic_scorer)
+    scorer.reranker._model = StubCrossEncoder()
+    return scorer
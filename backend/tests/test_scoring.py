@@ -2,20 +2,6 @@
 Unit tests for scoring module.
 """
 import pytest
-from app.scoring import ResumeScorer
-from sentence_transformers import SentenceTransformer
-
-
-@pytest.fixture
-def model():
-    """Load model once for all tests."""
-    return SentenceTransformer('all-MiniLM-L6-v2')
-
-
-@pytest.fixture
-def scorer(model):
-    """Create scorer instance."""
-    return ResumeScorer(model)
 
 
 def test_extract_keywords(scorer):
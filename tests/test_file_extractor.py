@@ -2,6 +2,8 @@
 Unit tests for file extraction module.
 """
 import pytest
+from hypothesis import given, settings, strategies as st
+
 from app.file_extractor import FileExtractor
 
 
@@ -45,6 +47,21 @@ def test_sanitize_filename():
     assert len(sanitized) <= 255
 
 
+@given(filename=st.text(max_size=400))
+@settings(deadline=None)
+def test_sanitize_filename_properties(filename):
+    """Fuzz sanitize_filename invariants over arbitrary filenames."""
+    sanitized = FileExtractor.sanitize_filename(filename)
+
+    assert len(sanitized) <= 255
+    # No path separators survive basename()
+    assert '/' not in sanitized
+    # No dangerous or control characters survive the deletion table
+    for ch in '<>:"|?*':
+        assert ch not in sanitized
+    assert not any(ord(ch) < 32 for ch in sanitized)
+
+
 def test_extract_text_from_txt():
     """Test TXT extraction."""
     content = b"Software engineer with 5 years of experience.\n\nPython, JavaScript, React."